@@ -2,34 +2,74 @@ import pandas as pd
 import emoji
 import nltk
 from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
 from collections import Counter
 import numpy as np
 from wordcloud import WordCloud
+import matplotlib
+matplotlib.use('Agg')  # Headless rendering backend, no GUI event loop cost
 import matplotlib.pyplot as plt
-import re
+
+# Low-dpi defaults: figures ship to the browser as embedded PNGs
+plt.rcParams['figure.dpi'] = 80
+plt.rcParams['savefig.dpi'] = 80
 import io
-import base64
-from PIL import Image
-import seaborn as sns
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+import functools
 import gc  # Garbage collection
+import pyarrow as pa
+import pyarrow.compute as pc
 
 # Import custom stop words
 from stop_words import get_stopwords
 
-# Download required NLTK resources
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+# Single fused RE2 pattern stripping URLs, punctuation and digits in one
+# pass. Arrow runs RE2, whose \w is ASCII-only, so letters, combining
+# marks (Devanagari matras) and digits must be named explicitly to keep
+# non-Latin scripts (Hindi etc.) intact
+_WORD_CLEAN_RE2 = r'http\S+|[^\p{L}\p{M}\p{N}_\s]|\d+'
+
+
+@functools.lru_cache(maxsize=1)
+def _stopwords():
+    """
+    Build the combined NLTK + custom stopword set once per process.
+
+    The NLTK corpus check/download and the set union only happen on the
+    first call; every ChatAnalyzer instance shares the same frozenset.
+    """
+    try:
+        nltk.data.find('tokenizers/punkt')
+    except LookupError:
+        nltk.download('punkt')
+
+    try:
+        nltk.data.find('corpora/stopwords')
+    except LookupError:
+        nltk.download('stopwords')
+
+    return frozenset(stopwords.words('english')) | frozenset(get_stopwords())
+
+
+def _cached_method(fn):
+    """
+    Memoize an analyzer method per instance, keyed on the call arguments.
+
+    Streamlit-style reruns call the same aggregates repeatedly on unchanged
+    data; cached results are reused until self.df is rebound to a new object.
+    """
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        if id(self.df) != self._cache_df_id:
+            self._cache = {}
+            self._cache_df_id = id(self.df)
+        key = (fn.__name__, args, tuple(sorted(kwargs.items())))
+        if key not in self._cache:
+            self._cache[key] = fn(self, *args, **kwargs)
+        return self._cache[key]
+    return wrapper
 
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
 
 class ChatAnalyzer:
     def __init__(self, df):
@@ -39,19 +79,28 @@ class ChatAnalyzer:
         Args:
             df (pd.DataFrame): Preprocessed chat DataFrame
         """
-        # Use pandas optimizations for memory efficiency
-        self.df = df.copy()
-        
-        # Convert object columns to categories where appropriate
-        for col in ['user', 'day_of_week', 'month_name']:
-            if col in self.df.columns:
+        # Shallow copy only - column buffers are shared with the caller and
+        # copy-on-write keeps our dtype casts from mutating the original
+        self.df = df.copy(deep=False)
+
+        # Keep the small fixed-cardinality calendar columns categorical, but
+        # leave 'user' as a plain string column - groupby on a
+        # high-cardinality categorical is drastically slower than on strings
+        for col in ['day_of_week', 'month_name']:
+            if col in self.df.columns and not isinstance(self.df[col].dtype, pd.CategoricalDtype):
                 self.df[col] = self.df[col].astype('category')
         
-        # Combine NLTK stopwords with our custom stopwords
-        nltk_stopwords = set(stopwords.words('english'))
-        custom_stopwords = get_stopwords()
-        self.stop_words = nltk_stopwords.union(custom_stopwords)
+        # Combined NLTK + custom stopwords, built once per process
+        self.stop_words = _stopwords()
+
+        # Rendered heatmap PNGs keyed by (user, data fingerprint)
+        self._heatmap_cache = {}
+
+        # Memoized aggregate results, invalidated when self.df is rebound
+        self._cache = {}
+        self._cache_df_id = id(self.df)
         
+    @_cached_method
     def get_basic_stats(self):
         """
         Get basic statistics about the chat
@@ -78,6 +127,7 @@ class ChatAnalyzer:
         }
         return stats
         
+    @_cached_method
     def get_active_users(self, top_n=10):
         """
         Get the most active users in the chat
@@ -92,7 +142,7 @@ class ChatAnalyzer:
             return pd.DataFrame()
             
         # Use optimized groupby
-        user_stats = self.df.groupby('user').agg({
+        user_stats = self.df.groupby('user', observed=True).agg({
             'message': 'count',
             'word_count': 'sum',
             'message_length': 'mean',
@@ -108,10 +158,10 @@ class ChatAnalyzer:
         
         # Clear memory
         del user_stats
-        gc.collect()
-        
+
         return result
         
+    @_cached_method
     def get_activity_by_time(self):
         """
         Get activity patterns by hour, day, and month
@@ -137,14 +187,13 @@ class ChatAnalyzer:
         daily.reset_index(inplace=True)
         daily.columns = ['date', 'message_count']
         
-        # Monthly activity with efficient string operations - fixed to avoid column naming issues
-        # Create year_month field first
-        self.df['year_month_str'] = self.df['datetime'].dt.strftime('%Y-%m')
-        monthly = self.df.groupby('year_month_str').size().reset_index(name='message_count')
-        monthly.columns = ['year_month', 'message_count']
+        # Monthly activity - group on the precomputed monthly period and only
+        # format it as a string at the output boundary
+        monthly = self.df.groupby('year_month', observed=True).size().reset_index(name='message_count')
+        monthly['year_month'] = monthly['year_month'].astype(str)
         
-        # Day of week activity
-        day_of_week = self.df.groupby('day_of_week', as_index=False)['message'].count()
+        # Day of week activity - observed groups only, ordering applied below
+        day_of_week = self.df.groupby('day_of_week', as_index=False, observed=True, sort=False)['message'].count()
         day_of_week.columns = ['day_of_week', 'message_count']
         # Ensure correct order of days
         day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
@@ -158,6 +207,7 @@ class ChatAnalyzer:
             'day_of_week_activity': day_of_week
         }
         
+    @_cached_method
     def get_word_analysis(self, top_n=20, min_length=3):
         """
         Analyze the most common words in the chat
@@ -167,45 +217,40 @@ class ChatAnalyzer:
             min_length (int): Minimum word length to consider
             
         Returns:
-            dict: Dictionary with word frequencies and analysis
+            dict: Word frequencies and the rendered wordcloud PNG bytes
         """
         if self.df.empty:
             return {
                 'word_freq': pd.DataFrame(),
-                'wordcloud_b64': None
+                'wordcloud_png': None
             }
             
-        # Process messages in chunks to save memory
-        chunk_size = 1000
-        words_counter = Counter()
-        
-        # Use list comprehension instead of multiple operations
-        for i in range(0, len(self.df), chunk_size):
-            chunk = self.df['message'].iloc[i:i+chunk_size]
-            
-            # Clean and tokenize all messages in one operation
-            text = ' '.join(chunk.fillna(''))
-            text = re.sub(r'http\S+', '', text)
-            text = re.sub(r'[^\w\s]', '', text)
-            text = re.sub(r'\d+', '', text)
-            
-            # Simple tokenization using split() instead of nltk.word_tokenize
-            words = [word for word in text.lower().split() 
-                    if word not in self.stop_words and len(word) >= min_length]
-            
-            # Update counter
-            words_counter.update(words)
-            
-            # Force garbage collection after each chunk
-            del chunk, text, words
-            gc.collect()
-        
-        # Get word frequency
-        word_freq = words_counter.most_common(top_n)
+        # Clean, tokenize and count entirely with Arrow compute kernels - one
+        # pass over the column, no Python-level Counter or explode round trip
+        arr = pc.utf8_lower(pa.Array.from_pandas(self.df['message'].fillna('')))
+        arr = pc.replace_substring_regex(arr, pattern=_WORD_CLEAN_RE2, replacement='')
+        tokens = pc.list_flatten(pc.utf8_split_whitespace(arr))
+
+        keep = pc.and_(
+            pc.greater_equal(pc.utf8_length(tokens), min_length),
+            pc.invert(pc.is_in(tokens, value_set=pa.array(sorted(self.stop_words))))
+        )
+        tokens = pc.filter(tokens, keep)
+
+        # Hashtable-backed counting in C
+        counts = pc.value_counts(tokens)
+        word_counts = pd.Series(
+            counts.field('counts').to_numpy(),
+            index=counts.field('values').to_pylist()
+        ).sort_values(ascending=False).head(top_n)
+
+        word_freq = list(word_counts.items())
         word_freq_df = pd.DataFrame(word_freq, columns=['word', 'frequency'])
-        
+
+        del arr, tokens, counts
+
         # Generate wordcloud only if there's enough data
-        if words_counter:
+        if word_freq:
             # Optimize wordcloud generation with max_words parameter
             wordcloud = WordCloud(
                 width=600,  # Reduce dimensions
@@ -215,26 +260,26 @@ class ChatAnalyzer:
                 max_font_size=80
             ).generate_from_frequencies(dict(word_freq))
             
-            # Compress image before encoding to reduce size
+            # Raw PNG bytes; the caller hands them to st.image, so no
+            # base64 round trip is needed
             img = io.BytesIO()
             wordcloud.to_image().save(img, format='PNG', optimize=True, quality=85)
-            img.seek(0)
-            wordcloud_b64 = base64.b64encode(img.getvalue()).decode('utf-8')
+            wordcloud_png = img.getvalue()
             
             # Clean up
             del wordcloud, img
         else:
-            wordcloud_b64 = None
-        
+            wordcloud_png = None
+
         # Clean up
-        del words_counter
-        gc.collect()
-        
+        del word_counts
+
         return {
             'word_freq': word_freq_df,
-            'wordcloud_b64': wordcloud_b64
+            'wordcloud_png': wordcloud_png
         }
         
+    @_cached_method
     def get_emoji_analysis(self, top_n=20):
         """
         Analyze emoji usage in the chat
@@ -263,6 +308,7 @@ class ChatAnalyzer:
         
         return emoji_freq_df
         
+    @_cached_method
     def get_media_analysis(self):
         """
         Analyze media sharing patterns
@@ -280,17 +326,13 @@ class ChatAnalyzer:
         total_media = int(self.df['has_media'].sum())
         
         # Media shared by user
-        media_by_user = self.df.groupby('user')['has_media'].sum().reset_index()
+        media_by_user = self.df.groupby('user', observed=True)['has_media'].sum().reset_index()
         media_by_user.columns = ['user', 'media_count']
         media_by_user = media_by_user.sort_values('media_count', ascending=False)
         
-        # Media shared over time - use the same approach as monthly activity
-        # Using consistent year_month_str column from datetime
-        if 'year_month_str' not in self.df.columns:
-            self.df['year_month_str'] = self.df['datetime'].dt.strftime('%Y-%m')
-            
-        media_over_time = self.df.groupby('year_month_str')['has_media'].sum().reset_index()
-        media_over_time.columns = ['year_month', 'has_media']
+        # Media shared over time - reuse the precomputed monthly period
+        media_over_time = self.df.groupby('year_month', observed=True)['has_media'].sum().reset_index()
+        media_over_time['year_month'] = media_over_time['year_month'].astype(str)
         
         return {
             'total_media': total_media,
@@ -306,30 +348,38 @@ class ChatAnalyzer:
             user (str): Filter for a specific user, or None for all users
             
         Returns:
-            str: Base64 encoded PNG image of the heatmap
+            bytes: Rendered PNG image of the heatmap
         """
+        # The rendered image only depends on the user filter and the data, so
+        # reuse the cached PNG when neither has changed
+        cache_key = (
+            user,
+            len(self.df),
+            int(self.df['datetime'].iloc[-1].value) if len(self.df) else 0
+        )
+        if cache_key in self._heatmap_cache:
+            return self._heatmap_cache[cache_key]
+
         # Filter data if user is provided
         if user and user != "All Users":
             data = self.df[self.df['user'] == user]
         else:
             data = self.df
-        
+
         # Early return if data is empty
         if data.empty:
             return None
         
-        # Only use needed columns
-        data = data[['hour', 'day_of_week']]
-        
-        # Create pivot table
-        pivot_table = pd.pivot_table(
-            data=data,
-            index='day_of_week',
-            columns='hour',
-            values='hour',
-            aggfunc='count',
-            fill_value=0
-        )
+        # Count day/hour cells with a single bincount over integer codes
+        # instead of a pivot_table groupby on the categorical column
+        day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+        day_codes = {day: i for i, day in enumerate(day_order)}
+
+        hours = data['hour'].to_numpy()
+        dows = data['day_of_week'].map(day_codes).to_numpy(dtype=np.int64)
+
+        hist = np.bincount(dows * 24 + hours, minlength=7 * 24).reshape(7, 24)
+        pivot_table = pd.DataFrame(hist, index=day_order, columns=range(24))
         
         # Check if pivot table is empty or has no data
         if pivot_table.empty or pivot_table.values.sum() == 0:
@@ -340,54 +390,42 @@ class ChatAnalyzer:
                     fontsize=12)
             plt.axis('off')
             
-            # Convert to base64
             img = io.BytesIO()
             plt.savefig(img, format='png', bbox_inches='tight', dpi=80)
             plt.close()
-            img.seek(0)
             
-            return base64.b64encode(img.getvalue()).decode('utf-8')
-        
-        # Create a new figure with reduced size
-        plt.figure(figsize=(8, 4), dpi=80)
-        
-        # Order days correctly
-        day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        pivot_table = pivot_table.reindex(day_order)
-        
-        # Create heatmap with optimized settings
-        ax = sns.heatmap(
-            pivot_table, 
-            cmap='YlGnBu',
-            linewidths=0.1,
-            linecolor='white',
-            annot=False,
-            cbar=True
-        )
+            return img.getvalue()
         
+        # Render the 7x24 grid directly with imshow - for a matrix this small
+        # seaborn's DataFrame handling and gridline drawing dominate the cost
+        fig, ax = plt.subplots(figsize=(8, 4), dpi=72)
+        im = ax.imshow(pivot_table.values, cmap='YlGnBu', aspect='auto')
+        fig.colorbar(im, ax=ax)
+
+        ax.set_xticks(range(24))
+        ax.set_yticks(range(7))
+        ax.set_yticklabels(day_order)
+
         # Set title and labels with reduced font sizes
         title = f"Activity Heatmap: {user}" if user and user != "All Users" else "Activity Heatmap: All Users"
-        plt.title(title, fontsize=10)
-        plt.xlabel('Hour of Day', fontsize=8)
-        plt.ylabel('Day of Week', fontsize=8)
-        
+        ax.set_title(title, fontsize=10)
+        ax.set_xlabel('Hour of Day', fontsize=8)
+        ax.set_ylabel('Day of Week', fontsize=8)
+
         # Set tick labels font size
-        plt.xticks(fontsize=7)
-        plt.yticks(fontsize=7)
-        
-        # Convert to base64
+        ax.tick_params(labelsize=7)
+
         img = io.BytesIO()
-        plt.savefig(img, format='png', bbox_inches='tight', dpi=80, optimize=True)
-        plt.close()
-        img.seek(0)
-        
-        heatmap_b64 = base64.b64encode(img.getvalue()).decode('utf-8')
+        fig.savefig(img, format='png', bbox_inches='tight', dpi=72)
+        plt.close(fig)
         
+        heatmap_png = img.getvalue()
+        self._heatmap_cache[cache_key] = heatmap_png
+
         # Clear memory
         del data, pivot_table, img
-        gc.collect()
-        
-        return heatmap_b64
+
+        return heatmap_png
         
     def create_message_trend_plot(self):
         """
@@ -451,16 +489,16 @@ class ChatAnalyzer:
         df_top = self.df[self.df['user'].isin(top_users)]
         
         # Prepare data for subplots
-        user_messages = df_top.groupby('user').size().reset_index(name='count')
+        user_messages = df_top.groupby('user', observed=True).size().reset_index(name='count')
         user_messages = user_messages.sort_values('count', ascending=False)
-        
-        user_words = df_top.groupby('user')['word_count'].sum().reset_index()
+
+        user_words = df_top.groupby('user', observed=True)['word_count'].sum().reset_index()
         user_words = user_words.sort_values('word_count', ascending=False)
-        
-        user_media = df_top.groupby('user')['has_media'].sum().reset_index()
+
+        user_media = df_top.groupby('user', observed=True)['has_media'].sum().reset_index()
         user_media = user_media.sort_values('has_media', ascending=False)
-        
-        user_emojis = df_top.groupby('user')['emoji_count'].sum().reset_index()
+
+        user_emojis = df_top.groupby('user', observed=True)['emoji_count'].sum().reset_index()
         user_emojis = user_emojis.sort_values('emoji_count', ascending=False)
         
         # Create subplots
@@ -508,16 +546,10 @@ class ChatAnalyzer:
         
     def cleanup_temp_data(self):
         """
-        Remove temporary columns and clear memory
+        Clear memory
         Should be called periodically to maintain memory efficiency
         """
-        # Remove temporary columns if they exist
-        temp_columns = ['year_month_str']
-        for col in temp_columns:
-            if col in self.df.columns:
-                self.df = self.df.drop(columns=[col])
-        
-        # Force garbage collection
+        # No temporary columns are created anymore; just force collection
         gc.collect()
         
     def __del__(self):
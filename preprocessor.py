@@ -1,14 +1,115 @@
 import re
+import numpy as np
 import pandas as pd
 import emoji
 from urlextract import URLExtract
-from datetime import datetime
+from multiprocessing import Pool, cpu_count
 import html
-import gc
+
+# Optional linear-time DFA regex engine (google-re2). Large literal
+# alternations like the emoji pattern scan much faster under a DFA; fall
+# back to the stdlib backtracking engine when re2 is not installed.
+try:
+    import re2
+except ImportError:
+    re2 = None
 
 # Initialize URL extractor once
 extractor = URLExtract()
 
+
+def _compile_scan_pattern(pattern, flags=0):
+    """Compile a scanning pattern with re2 when available, else stdlib re"""
+    if re2 is not None:
+        try:
+            return re2.compile(pattern, flags)
+        except re2.error:
+            pass
+    return re.compile(pattern, flags)
+
+# Patterns for different date formats and message parts
+PATTERN_12HR = r'(\d{1,2}/\d{1,2}/\d{2,4}),\s(\d{1,2}:\d{2}\s[APap][Mm])\s-\s(.*?):\s(.*)'
+PATTERN_24HR = r'(\d{1,2}/\d{1,2}/\d{2,4}),\s(\d{1,2}:\d{2})\s-\s(.*?):\s(.*)'
+# Pattern for the [DD.MM.YYYY, HH:MM:SS] format
+PATTERN_BRACKET = r'\[(\d{1,2}\.\d{1,2}\.\d{4}),\s(\d{1,2}:\d{2}:\d{2})\]\s(.*?):\s(.*)'
+
+# Single alternation so the whole chat is scanned once with finditer instead
+# of matching three patterns against every line
+MESSAGE_PATTERN = re.compile(
+    r'(?m)^(?:' + PATTERN_12HR + r'|' + PATTERN_24HR + r'|' + PATTERN_BRACKET + r')'
+)
+
+# Precompiled pattern for media placeholder messages
+MEDIA_PATTERN = re.compile(r'omitted|<media omitted>', re.IGNORECASE)
+
+# Precompiled alternation over all known emoji, longest-first so multi-codepoint
+# sequences win over their component characters. Built once at import so the
+# per-character Python loop is replaced by the regex engine; with re2 installed
+# this huge alternation is scanned by a linear-time DFA instead of backtracking.
+EMOJI_PATTERN = _compile_scan_pattern('|'.join(map(re.escape, sorted(emoji.EMOJI_DATA, key=len, reverse=True))))
+
+# Minimum number of messages before spawning worker processes is worth the fork overhead
+URL_PARALLEL_THRESHOLD = 5000
+
+# Per-worker URLExtract instance, created once per process by _init_url_worker
+_worker_extractor = None
+
+
+def _init_url_worker():
+    """Initializer for URL extraction workers - build one URLExtract per process"""
+    global _worker_extractor
+    _worker_extractor = URLExtract()
+
+
+def _find_urls(text):
+    """Extract URLs from a single message using the per-worker extractor"""
+    return _worker_extractor.find_urls(text)
+
+
+def extract_urls(messages):
+    """
+    Extract URLs from a list of messages, using a process pool for large chats
+
+    Args:
+        messages (list): Message strings to scan
+
+    Returns:
+        list: List of URL lists, one per message
+    """
+    if len(messages) < URL_PARALLEL_THRESHOLD:
+        return [extractor.find_urls(m) for m in messages]
+
+    workers = cpu_count()
+    chunksize = max(1, len(messages) // (workers * 4))
+    with Pool(workers, initializer=_init_url_worker) as pool:
+        # map (not imap_unordered) so results stay aligned with the input rows
+        return pool.map(_find_urls, messages, chunksize=chunksize)
+
+
+def _find_emojis(text):
+    """Extract emojis from a single message with the precompiled pattern"""
+    return EMOJI_PATTERN.findall(text)
+
+
+def extract_emojis(messages):
+    """
+    Extract emojis from a list of messages, using a process pool for large chats
+
+    Args:
+        messages (list): Message strings to scan
+
+    Returns:
+        list: List of emoji lists, one per message
+    """
+    if len(messages) < URL_PARALLEL_THRESHOLD:
+        return [EMOJI_PATTERN.findall(m) for m in messages]
+
+    workers = cpu_count()
+    chunksize = max(1, len(messages) // (workers * 4))
+    with Pool(workers) as pool:
+        # Workers inherit EMOJI_PATTERN via fork, no re-initialization needed
+        return pool.map(_find_emojis, messages, chunksize=chunksize)
+
 def parse_chat(data):
     """
     Parse WhatsApp chat data from a .txt file and convert to a DataFrame
@@ -19,78 +120,55 @@ def parse_chat(data):
     Returns:
         df (pd.DataFrame): DataFrame with structured chat data
     """
-    # Define patterns for different date formats and message parts
-    pattern_12hr = r'(\d{1,2}/\d{1,2}/\d{2,4}),\s(\d{1,2}:\d{2}\s[APap][Mm])\s-\s(.*?):\s(.*)'
-    pattern_24hr = r'(\d{1,2}/\d{1,2}/\d{2,4}),\s(\d{1,2}:\d{2})\s-\s(.*?):\s(.*)'
-    
-    # Add a new pattern for the [DD.MM.YYYY, HH:MM:SS] format
-    pattern_bracket_format = r'\[(\d{1,2}\.\d{1,2}\.\d{4}),\s(\d{1,2}:\d{2}:\d{2})\]\s(.*?):\s(.*)'
-    
-    # Initialize empty lists to store data
-    dates = []
-    times = []
-    users = []
-    messages = []
-    
-    # Precompile regex patterns for better performance
-    regex_12hr = re.compile(pattern_12hr)
-    regex_24hr = re.compile(pattern_24hr)
-    regex_bracket = re.compile(pattern_bracket_format)
-    
-    # Split data into lines and process in chunks
-    lines = data.split('\n')
-    
-    # Process in chunks to reduce memory usage
-    chunk_size = 5000
-    for i in range(0, len(lines), chunk_size):
-        chunk_lines = lines[i:i+chunk_size]
-        
-        for line in chunk_lines:
-            # Try to match line with the patterns
-            match_12hr = regex_12hr.match(line)
-            match_24hr = regex_24hr.match(line)
-            match_bracket = regex_bracket.match(line)
-            
-            if match_12hr:
-                dates.append(match_12hr.group(1))
-                times.append(match_12hr.group(2))
-                users.append(match_12hr.group(3))
-                # Store the raw message - will be cleaned when displayed
-                messages.append(match_12hr.group(4))
-            elif match_24hr:
-                dates.append(match_24hr.group(1))
-                times.append(match_24hr.group(2))
-                users.append(match_24hr.group(3))
-                # Store the raw message - will be cleaned when displayed
-                messages.append(match_24hr.group(4))
-            elif match_bracket:
-                dates.append(match_bracket.group(1))
-                times.append(match_bracket.group(2))
-                users.append(match_bracket.group(3))
-                # Store the raw message - will be cleaned when displayed
-                messages.append(match_bracket.group(4))
-            else:
-                # If the line doesn't match a new message pattern, 
-                # it's likely a continuation of the previous message
-                if len(messages) > 0:
-                    messages[-1] += '\n' + line
-    
-    # Create a DataFrame efficiently
+    # Find all message headers in a single C-level scan over the whole blob;
+    # everything between two consecutive headers is continuation text
+    matches = list(MESSAGE_PATTERN.finditer(data))
+
+    # Preallocate the column arrays now that the match count is known,
+    # avoiding list resize copies and a second set of object arrays on
+    # DataFrame construction
+    n = len(matches)
+    dates = np.empty(n, dtype=object)
+    times = np.empty(n, dtype=object)
+    users = np.empty(n, dtype=object)
+    messages = np.empty(n, dtype=object)
+
+    for i, match in enumerate(matches):
+        # Only one alternative matched, so pick its group block
+        groups = match.groups()
+        if groups[0] is not None:       # 12-hour format
+            date, time, user, message = groups[0:4]
+        elif groups[4] is not None:     # 24-hour format
+            date, time, user, message = groups[4:8]
+        else:                           # [DD.MM.YYYY, HH:MM:SS] format
+            date, time, user, message = groups[8:12]
+
+        # Append any continuation lines up to the next message header
+        tail_end = matches[i + 1].start() if i + 1 < len(matches) else len(data)
+        tail = data[match.end():tail_end]
+        if tail.endswith('\n'):
+            tail = tail[:-1]
+        if tail:
+            message += tail
+
+        dates[i] = date
+        times[i] = time
+        users[i] = user
+        # Store the raw message - will be cleaned when displayed
+        messages[i] = message
+
+    # Create a DataFrame with Arrow-backed strings so the contiguous buffers
+    # cut memory and later .str operations run on Arrow kernels
     df = pd.DataFrame({
-        'date': dates,
-        'time': times,
-        'user': users,
-        'message': messages
+        'date': pd.array(dates, dtype='string[pyarrow]'),
+        'time': pd.array(times, dtype='string[pyarrow]'),
+        'user': pd.array(users, dtype='string[pyarrow]'),
+        'message': pd.array(messages, dtype='string[pyarrow]')
     })
-    
-    # Use category data type for certain columns to save memory
-    if not df.empty:
-        df['user'] = df['user'].astype('category')
-    
+
     # Free up memory
-    del dates, times, users, messages, lines
-    gc.collect()
-    
+    del dates, times, users, messages, matches
+
     return df
 
 
@@ -142,40 +220,44 @@ def preprocess(df):
         # Use dayfirst=True as a fallback to prioritize DD/MM/YYYY over MM/DD/YYYY
         df['date'] = pd.to_datetime(df['date'], dayfirst=True, errors='coerce')
     
-    # Convert 12-hour format to 24-hour format if needed, using vectorized operations
-    def convert_time(time_str):
-        if not isinstance(time_str, str):
-            return time_str
-            
-        if 'AM' in time_str or 'PM' in time_str or 'am' in time_str or 'pm' in time_str:
-            try:
-                return datetime.strptime(time_str, '%I:%M %p').strftime('%H:%M')
-            except:
-                return time_str
-        if ':' in time_str and time_str.count(':') == 2:  # HH:MM:SS format
-            try:
-                return datetime.strptime(time_str, '%H:%M:%S').strftime('%H:%M')
-            except:
-                return time_str
-        return time_str
-    
-    # Apply conversion in chunks to avoid memory issues
-    chunk_size = 5000
-    for i in range(0, len(df), chunk_size):
-        chunk_end = min(i + chunk_size, len(df))
-        df.loc[i:chunk_end, 'time'] = df.loc[i:chunk_end, 'time'].apply(convert_time)
+    # Parse times with two vectorized pd.to_datetime passes split by an AM/PM
+    # mask; 24-hour and HH:MM:SS values both go through the mixed-format pass
+    mask_ampm = df['time'].str.contains(r'[APap][Mm]', regex=True, na=False)
+    t_12hr = pd.to_datetime(df['time'].where(mask_ampm), format='%I:%M %p', errors='coerce')
+    t_24hr = pd.to_datetime(df['time'].where(~mask_ampm), format='mixed', errors='coerce')
+    parsed_time = t_12hr.combine_first(t_24hr)
+
+    df['time'] = parsed_time.dt.strftime('%H:%M')
     
-    # Create datetime column
-    df['datetime'] = pd.to_datetime(df['date'].astype(str) + ' ' + df['time'])
+    # Create datetime column from the already-parsed components instead of
+    # re-parsing concatenated date+time strings
+    df['datetime'] = df['date'] + pd.to_timedelta(
+        parsed_time.dt.hour * 3600 + parsed_time.dt.minute * 60, unit='s'
+    )
+
+    # Rows whose date or time failed to parse are NaT here; drop them now,
+    # because the narrow integer casts below cannot represent missing values
+    # and the int64 view would fabricate hour/minute for NaT
+    df = df[df['datetime'].notna()].reset_index(drop=True)
     
-    # Extract additional time features efficiently
-    df['hour'] = df['datetime'].dt.hour
-    df['minute'] = df['datetime'].dt.minute
-    df['day'] = df['datetime'].dt.day
-    df['day_of_week'] = df['datetime'].dt.day_name()
-    df['month'] = df['datetime'].dt.month
-    df['month_name'] = df['datetime'].dt.month_name()
-    df['year'] = df['datetime'].dt.year
+    # Extract additional time features from one decoded copy of the datetime
+    # column instead of seven separate .dt accessor passes: hour/minute come
+    # from plain int64 arithmetic, the calendar fields share one DatetimeIndex
+    dt64 = df['datetime'].to_numpy(dtype='datetime64[s]')
+    seconds = dt64.view('int64')
+    df['hour'] = ((seconds // 3600) % 24).astype('int8')
+    df['minute'] = ((seconds // 60) % 60).astype('int8')
+
+    dt_index = pd.DatetimeIndex(dt64)
+    df['day'] = dt_index.day.astype('int8')
+    df['day_of_week'] = dt_index.day_name()
+    df['month'] = dt_index.month.astype('int8')
+    df['month_name'] = dt_index.month_name()
+    df['year'] = dt_index.year.astype('int16')
+
+    # Monthly period for timeline groupings - an int64 internally, far cheaper
+    # than per-row strftime('%Y-%m') at analysis time
+    df['year_month'] = df['datetime'].dt.to_period('M')
     
     # Convert categorical columns to save memory
     df['day_of_week'] = df['day_of_week'].astype('category')
@@ -185,32 +267,23 @@ def preprocess(df):
     # Use vectorized operations when possible
     df['message_length'] = df['message'].str.len()
     
-    # Handle NaN values safely
-    df['word_count'] = df['message'].fillna('').apply(lambda x: len(x.split()))
-    
-    # Check if message contains media
-    media_terms = ['omitted', '<media omitted>']
-    df['has_media'] = df['message'].fillna('').str.lower().apply(
-        lambda x: 1 if any(term in x for term in media_terms) else 0
-    )
-    
-    # Process URLs directly with vectorized operations instead of chunking
-    df['has_url'] = df['message'].fillna('').apply(lambda x: bool(extractor.find_urls(x)))
-    df['url_count'] = df['message'].fillna('').apply(lambda x: len(extractor.find_urls(x)))
-    
-    # Extract emojis in chunks to prevent memory issues
-    def extract_emojis(text):
-        if not isinstance(text, str):
-            return []
-        return [c for c in text if c in emoji.EMOJI_DATA]
-    
-    # Process emojis with vectorized operations
-    df['emojis'] = df['message'].fillna('').apply(extract_emojis)
-    df['emoji_count'] = df['emojis'].apply(len)
-    
-    # Clean up memory
-    gc.collect()
+    # Handle NaN values safely with vectorized string operations
+    df['word_count'] = df['message'].str.split().str.len().fillna(0).astype('int16')
+
+    # Check if message contains media with a single precompiled regex
+    df['has_media'] = df['message'].fillna('').str.contains(MEDIA_PATTERN, regex=True).astype(bool)
+
+    # Extract URLs once and derive both columns from the same pass,
+    # fanning out to worker processes for large chats
+    urls = pd.Series(extract_urls(df['message'].fillna('').tolist()), index=df.index)
+    df['url_count'] = urls.str.len().astype('int16')
+    df['has_url'] = df['url_count'] > 0
     
+    # Extract emojis with the precompiled alternation regex instead of a
+    # per-character Python loop, fanning out to workers for large chats
+    df['emojis'] = pd.Series(extract_emojis(df['message'].fillna('').tolist()), index=df.index)
+    df['emoji_count'] = df['emojis'].str.len().astype('int16')
+
     return df
 
 
@@ -1,104 +1,477 @@
 """
 Custom stop words for WhatsApp chat analysis.
 """
+import marshal
+import pathlib
+import re
+import sys
+import unicodedata
+from functools import cache, lru_cache
+from typing import Final, Iterable, Iterator
+
+import numpy as np
+
+# Optional C-extension Aho-Corasick automaton for single-pass bulk stripping
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Optional non-backtracking regex engine; falls back to stdlib re
+try:
+    import regex as _regex
+except ImportError:
+    _regex = re
+
+# Optional SIMD-vectorized Roaring bitmap for hashed batch membership
+try:
+    from pyroaring import BitMap64
+except ImportError:
+    BitMap64 = None
+
+# Generated minimal perfect-hash table (tools/gen_phf.py): single-probe
+# membership with no collisions, used by is_stopword when present and current
+try:
+    import stop_words_phf as _phf
+except ImportError:
+    _phf = None
 
 # Common English stop words that might not be in NLTK's default set
-CUSTOM_ENGLISH_STOPWORDS = {
+CUSTOM_ENGLISH_STOPWORDS: Final[frozenset[str]] = frozenset({
     # Common filler words
-    "um", "uh", "hmm", "oh", "ah", "er", "yeah", "yes", "no", "okay", "ok", 
-    "like", "so", "well", "just", "actually", "basically", "literally", "really", 
+    "um", "uh", "hmm", "oh", "ah", "er", "yeah", "yes", "no", "okay", "ok",
+    "like", "so", "well", "just", "actually", "basically", "literally", "really",
     "very", "quite", "pretty", "totally", "absolutely", "definitely",
-    
+
     # Common chat abbreviations
     "lol", "lmao", "rofl", "btw", "omg", "idk", "tbh", "imo", "imho", "fyi",
     "afaik", "brb", "ttyl", "ttys", "thx", "ty", "np", "pls", "plz", "u", "r",
     "y", "k", "b", "c", "d", "g", "m", "n", "s", "w", "rn",
-    
+
     # WhatsApp specific terms
-    "media", "omitted", "deleted", "message", "audio", "image", "video", "sticker", 
-    "gif", "document", "contact", "location", "live", "photo", "voice", "missed", 
-    "call", "joined", "left", "group", "created", "changed", "removed", "added", 
+    "media", "omitted", "deleted", "message", "audio", "image", "video", "sticker",
+    "gif", "document", "contact", "location", "live", "photo", "voice", "missed",
+    "call", "joined", "left", "group", "created", "changed", "removed", "added",
     "subject", "icon", "description", "link", "url",
-    
+
     # Common words that might not be informative
-    "day", "today", "tomorrow", "yesterday", "morning", "afternoon", "evening", 
-    "night", "week", "month", "year", "time", "thing", "stuff", "way", "bit", 
-    "lot", "kind", "sort", "type", "part", "good", "bad", "great", "nice", 
+    "day", "today", "tomorrow", "yesterday", "morning", "afternoon", "evening",
+    "night", "week", "month", "year", "time", "thing", "stuff", "way", "bit",
+    "lot", "kind", "sort", "type", "part", "good", "bad", "great", "nice",
     "cool", "awesome", "amazing", "wonderful", "terrible", "horrible", "awful",
-    
+
     # Common pronouns and prepositions (might already be in NLTK)
-    "i", "me", "my", "mine", "myself", "you", "your", "yours", "yourself", 
-    "he", "him", "his", "himself", "she", "her", "hers", "herself", "it", 
-    "its", "itself", "we", "us", "our", "ours", "ourselves", "they", "them", 
-    "their", "theirs", "themselves", "this", "that", "these", "those", "here", 
-    "there", "where", "when", "why", "how", "what", "who", "whom", "whose", 
-    "which", "is", "am", "are", "was", "were", "be", "been", "being", "have", 
-    "has", "had", "having", "do", "does", "did", "doing", "will", "would", 
-    "shall", "should", "may", "might", "must", "can", "could", "a", "an", 
-    "the", "and", "or", "but", "if", "then", "else", "when", "up", "down", 
-    "in", "out", "on", "off", "over", "under", "again", "further", "then", 
-    "once", "here", "there", "all", "any", "both", "each", "few", "more", 
-    "most", "other", "some", "such", "only", "own", "same", "so", "than", 
-    "too", "very", "s", "t", "can", "will", "just", "now", "d", "ll", "m", 
-    "o", "re", "ve", "y", "ain", "aren", "couldn", "didn", "doesn", "hadn", 
-    "hasn", "haven", "isn", "ma", "mightn", "mustn", "needn", "shan", 
+    "i", "me", "my", "mine", "myself", "you", "your", "yours", "yourself",
+    "he", "him", "his", "himself", "she", "her", "hers", "herself", "it",
+    "its", "itself", "we", "us", "our", "ours", "ourselves", "they", "them",
+    "their", "theirs", "themselves", "this", "that", "these", "those", "here",
+    "there", "where", "when", "why", "how", "what", "who", "whom", "whose",
+    "which", "is", "am", "are", "was", "were", "be", "been", "being", "have",
+    "has", "had", "having", "do", "does", "did", "doing", "will", "would",
+    "shall", "should", "may", "might", "must", "can", "could", "a", "an",
+    "the", "and", "or", "but", "if", "then", "else", "up", "down",
+    "in", "out", "on", "off", "over", "under", "again", "further",
+    "once", "all", "any", "both", "each", "few", "more",
+    "most", "other", "some", "such", "only", "own", "same", "than",
+    "too", "t", "now", "ll",
+    "o", "re", "ve", "ain", "aren", "couldn", "didn", "doesn", "hadn",
+    "hasn", "haven", "isn", "ma", "mightn", "mustn", "needn", "shan",
     "shouldn", "wasn", "weren", "won", "wouldn"
-}
+})
 
-# Hindi/Hinglish stop words for multilingual chats
-HINDI_STOPWORDS = {
-    "मैं", "मेरा", "मुझे", "मुझको", "हम", "हमारा", "हमें", "हमको", "आप", "आपका", 
-    "आपको", "तू", "तेरा", "तुझे", "तुम", "तुम्हारा", "तुम्हें", "तुमको", "वह", 
-    "उसका", "उसे", "उसको", "वे", "उनका", "उन्हें", "उनको", "यह", "इसका", 
-    "इसे", "इसको", "ये", "इनका", "इन्हें", "इनको", "कौन", "किसका", "किसे", 
-    "किसको", "क्या", "कब", "कहाँ", "कैसे", "क्यों", "और", "या", "लेकिन", 
-    "अगर", "फिर", "भी", "जब", "तक", "यहाँ", "वहाँ", "कुछ", "सब", "कोई", 
-    "थोड़ा", "बहुत", "ज्यादा", "अधिक", "कम", "साथ", "पर", "में", "के", "का", 
-    "की", "है", "हैं", "था", "थे", "थी", "थीं", "हो", "होता", "होती", "होते", 
-    "हुआ", "हुए", "हुई", "हुईं", "करना", "करता", "करती", "करते", "किया", 
-    "किए", "किया", "किये", "जा", "जाना", "जाता", "जाती", "जाते", "गया", 
-    "गए", "गई", "गईं", "रहना", "रहता", "रहती", "रहते", "रहा", "रहे", "रही", 
-    "रहीं", "एक", "दो", "तीन", "चार", "पाँच", "छह", "सात", "आठ", "नौ", "दस",
-    
-    # Hinglish (Hindi written in English)
-    "main", "mera", "mujhe", "mujhko", "hum", "hamara", "hame", "hamko", "aap", 
-    "aapka", "aapko", "tu", "tera", "tujhe", "tum", "tumhara", "tumhe", "tumko", 
-    "woh", "uska", "use", "usko", "wo", "unka", "unhe", "unko", "yeh", "iska", 
-    "ise", "isko", "ye", "inka", "inhe", "inko", "kaun", "kiska", "kise", "kisko", 
-    "kya", "kab", "kahan", "kaise", "kyun", "aur", "ya", "lekin", "agar", "phir", 
-    "bhi", "jab", "tak", "yahan", "wahan", "kuch", "sab", "koi", "thoda", "bahut", 
-    "zyada", "adhik", "kam", "saath", "par", "me", "ke", "ka", "ki", "hai", "hain", 
-    "tha", "the", "thi", "thin", "ho", "hota", "hoti", "hote", "hua", "hue", "hui", 
-    "huin", "karna", "karta", "karti", "karte", "kiya", "kiye", "kiya", "kiye", 
-    "ja", "jana", "jata", "jati", "jate", "gaya", "gaye", "gayi", "gayin", "rehna", 
-    "rehta", "rehti", "rehte", "raha", "rahe", "rahi", "rahin", "ek", "do", "teen", 
-    "char", "paanch", "cheh", "saat", "aath", "nau", "das"
-}
 
-# Additional emoji descriptions that might appear when emojis are rendered as text
-EMOJI_DESCRIPTIONS = {
-    "smiley", "smile", "laughing", "blush", "grin", "wink", "heart", "kiss", 
-    "kissing", "tongue", "thinking", "unamused", "expressionless", "neutral", 
-    "speechless", "shocked", "surprised", "wow", "tear", "crying", "sob", "angry", 
-    "rage", "triumph", "sleepy", "tired", "yawning", "mask", "sick", "injured", 
-    "bandage", "nauseated", "vomiting", "sneezing", "fever", "cold", "face", 
-    "eyes", "eye", "ear", "nose", "mouth", "lips", "tongue", "hand", "hands", 
-    "clap", "thumbs", "up", "down", "fist", "punch", "wave", "ok", "pinch", 
-    "pinching", "v", "crossed", "fingers", "hand", "vulcan", "metal", "call", 
-    "backhand", "index", "middle", "ring", "little", "index_pointing", "point", 
-    "pointing", "fist", "raised", "oncoming", "left", "right", "folded", "handshake", 
-    "nail", "polish", "selfie", "muscle", "leg", "foot", "ear", "nose", "brain", 
-    "tooth", "bone", "baby", "child", "boy", "girl", "adult", "man", "woman", 
-    "person", "blonde", "bearded", "older", "old", "police", "guard", "detective", 
-    "christmas", "claus", "superhero", "supervillain", "mage", "fairy", "elf", 
-    "genie", "zombie"
+@cache
+def _build_hindi() -> frozenset[str]:
+    """Hindi/Hinglish stop words for multilingual chats, built on first use"""
+    return frozenset({
+        "मैं", "मेरा", "मुझे", "मुझको", "हम", "हमारा", "हमें", "हमको", "आप", "आपका",
+        "आपको", "तू", "तेरा", "तुझे", "तुम", "तुम्हारा", "तुम्हें", "तुमको", "वह",
+        "उसका", "उसे", "उसको", "वे", "उनका", "उन्हें", "उनको", "यह", "इसका",
+        "इसे", "इसको", "ये", "इनका", "इन्हें", "इनको", "कौन", "किसका", "किसे",
+        "किसको", "क्या", "कब", "कहाँ", "कैसे", "क्यों", "और", "या", "लेकिन",
+        "अगर", "फिर", "भी", "जब", "तक", "यहाँ", "वहाँ", "कुछ", "सब", "कोई",
+        "थोड़ा", "बहुत", "ज्यादा", "अधिक", "कम", "साथ", "पर", "में", "के", "का",
+        "की", "है", "हैं", "था", "थे", "थी", "थीं", "हो", "होता", "होती", "होते",
+        "हुआ", "हुए", "हुई", "हुईं", "करना", "करता", "करती", "करते", "किया",
+        "किए", "किया", "किये", "जा", "जाना", "जाता", "जाती", "जाते", "गया",
+        "गए", "गई", "गईं", "रहना", "रहता", "रहती", "रहते", "रहा", "रहे", "रही",
+        "रहीं", "एक", "दो", "तीन", "चार", "पाँच", "छह", "सात", "आठ", "नौ", "दस",
+
+        # Hinglish (Hindi written in English)
+        "main", "mera", "mujhe", "mujhko", "hum", "hamara", "hame", "hamko", "aap",
+        "aapka", "aapko", "tu", "tera", "tujhe", "tum", "tumhara", "tumhe", "tumko",
+        "woh", "uska", "use", "usko", "wo", "unka", "unhe", "unko", "yeh", "iska",
+        "ise", "isko", "ye", "inka", "inhe", "inko", "kaun", "kiska", "kise", "kisko",
+        "kya", "kab", "kahan", "kaise", "kyun", "aur", "ya", "lekin", "agar", "phir",
+        "bhi", "jab", "tak", "yahan", "wahan", "kuch", "sab", "koi", "thoda", "bahut",
+        "zyada", "adhik", "kam", "saath", "par", "me", "ke", "ka", "ki", "hai", "hain",
+        "tha", "the", "thi", "thin", "ho", "hota", "hoti", "hote", "hua", "hue", "hui",
+        "huin", "karna", "karta", "karti", "karte", "kiya", "kiye", "kiya", "kiye",
+        "ja", "jana", "jata", "jati", "jate", "gaya", "gaye", "gayi", "gayin", "rehna",
+        "rehta", "rehti", "rehte", "raha", "rahe", "rahi", "rahin", "ek", "do", "teen",
+        "char", "paanch", "cheh", "saat", "aath", "nau", "das"
+    })
+
+
+@cache
+def _build_emoji() -> frozenset[str]:
+    """Emoji descriptions that may appear when emojis render as text"""
+    return frozenset({
+        "smiley", "smile", "laughing", "blush", "grin", "wink", "heart", "kiss",
+        "kissing", "tongue", "thinking", "unamused", "expressionless", "neutral",
+        "speechless", "shocked", "surprised", "wow", "tear", "crying", "sob", "angry",
+        "rage", "triumph", "sleepy", "tired", "yawning", "mask", "sick", "injured",
+        "bandage", "nauseated", "vomiting", "sneezing", "fever", "cold", "face",
+        "eyes", "eye", "ear", "nose", "mouth", "lips", "tongue", "hand", "hands",
+        "clap", "thumbs", "up", "down", "fist", "punch", "wave", "ok", "pinch",
+        "pinching", "v", "crossed", "fingers", "hand", "vulcan", "metal", "call",
+        "backhand", "index", "middle", "ring", "little", "index_pointing", "point",
+        "pointing", "fist", "raised", "oncoming", "left", "right", "folded", "handshake",
+        "nail", "polish", "selfie", "muscle", "leg", "foot", "ear", "nose", "brain",
+        "tooth", "bone", "baby", "child", "boy", "girl", "adult", "man", "woman",
+        "person", "blonde", "bearded", "older", "old", "police", "guard", "detective",
+        "christmas", "claus", "superhero", "supervillain", "mage", "fairy", "elf",
+        "genie", "zombie"
+    })
+
+
+# Precomputed blob written by tools/build_stopwords.py; loading it skips the
+# normalize/intern/union build below
+_MARSHAL_PATH = pathlib.Path(__file__).with_suffix('.marshal')
+
+
+def _load_marshalled_stopwords() -> frozenset[str] | None:
+    """Load the prebuilt stopword blob, or None when absent/corrupt"""
+    try:
+        with open(_MARSHAL_PATH, 'rb') as fh:
+            blob = marshal.load(fh)
+        return frozenset(sys.intern(w) for w in blob)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+
+def _is_devanagari(word: str) -> bool:
+    """True if any character of the word is in the Devanagari block"""
+    return any(0x0900 <= ord(c) <= 0x097F for c in word)
+
+
+@cache
+def _by_lang() -> dict[str, frozenset[str]]:
+    """
+    Partition the stopwords by language, built on first use.
+
+    The Hindi set splits into its Devanagari half ("hi") and the Hinglish
+    transliterations ("hi_latn") by script detection, so callers that know
+    the chat language can probe a much smaller table.
+    """
+    hindi = _build_hindi()
+    return {
+        "en": CUSTOM_ENGLISH_STOPWORDS,
+        "hi": frozenset(w for w in hindi if _is_devanagari(w)),
+        "hi_latn": frozenset(w for w in hindi if not _is_devanagari(w)),
+        "emoji": _build_emoji(),
+    }
+
+
+@cache
+def _all_stopwords() -> frozenset[str]:
+    """
+    Combine all stop words into a single immutable set, built on first use.
+
+    Building through one mutable accumulator avoids the intermediate tables
+    chained unions allocate. Entries are guaranteed NFKC-normalized lowercase
+    so callers can match tokens without re-normalizing the set side, and are
+    interned so lookups against interned tokens hit the pointer-identity
+    fast path.
+    """
+    loaded = _load_marshalled_stopwords()
+    if loaded is not None:
+        return loaded
+
+    _acc = set(CUSTOM_ENGLISH_STOPWORDS)
+    _acc.update(_build_hindi())
+    _acc.update(_build_emoji())
+    return frozenset(sys.intern(unicodedata.normalize("NFKC", w).lower()) for w in _acc)
+
+
+@cache
+def _split_sets() -> tuple[frozenset[str], frozenset[str]]:
+    """
+    Partition the stopwords into (ascii, non_ascii) frozensets.
+
+    Most chat tokens are ASCII, so the common path probes a smaller
+    ASCII-only table; Devanagari and other non-ASCII entries get their own.
+    """
+    all_stopwords = _all_stopwords()
+    ascii_set = frozenset(w for w in all_stopwords if w.isascii())
+    return ascii_set, all_stopwords - ascii_set
+
+
+@cache
+def _packed_ascii() -> np.ndarray:
+    """
+    Pack ASCII entries of at most 8 bytes null-padded into a uint64 array,
+    so batch membership over a whole token array is one vectorized np.isin
+    against contiguous memory instead of a Python loop of set probes.
+    """
+    return np.array(
+        sorted(int.from_bytes(w.encode().ljust(8, b'\0'), 'little')
+               for w in _split_sets()[0] if len(w) <= 8),
+        dtype='<u8'
+    )
+
+
+_FNV_OFFSET = 0xcbf29ce484222325
+_FNV_PRIME = 0x100000001b3
+
+
+def _fnv1a(data: bytes) -> int:
+    """64-bit FNV-1a over bytes - fixed hash, stable across interpreter runs"""
+    h = _FNV_OFFSET
+    for b in data:
+        h = ((h ^ b) * _FNV_PRIME) & 0xFFFFFFFFFFFFFFFF
+    return h
+
+
+@cache
+def _stop_hashes():
+    """Roaring bitmap of FNV-1a stopword hashes, or None without pyroaring"""
+    if BitMap64 is None:
+        return None
+    return BitMap64(_fnv1a(w.encode()) for w in _all_stopwords())
+
+
+# Byte-trie tables written by tools/gen_trie.py
+_TRIE_PATH = pathlib.Path(__file__).with_name('stop_words_trie.npz')
+
+
+@cache
+def _trie():
+    """Load the generated byte-trie tables, or None when absent"""
+    try:
+        with np.load(_TRIE_PATH) as blob:
+            return blob['transitions'], blob['accept']
+    except OSError:
+        return None
+
+
+def is_stopword_trie(token: str) -> bool:
+    """
+    Stopword check via the generated UTF-8 byte trie
+
+    One int32 table walk per byte, no hashing - the table is small enough
+    to stay cache-resident and dead transitions reject most non-stopwords
+    within a byte or two. Opt-in: without a compiled inner loop the
+    interpreted walk does not beat the frozenset, so is_stopword keeps
+    its existing dispatch; falls back to it when the table is missing.
+
+    Args:
+        token (str): Token to test
+
+    Returns:
+        bool: True if the normalized token is a stop word
+    """
+    tables = _trie()
+    if tables is None:
+        return is_stopword(token)
+    transitions, accept = tables
+    state = 0
+    for b in unicodedata.normalize("NFKC", token).casefold().encode():
+        state = transitions[state, b]
+        if state < 0:
+            return False
+    return bool(accept[state])
+
+
+@cache
+def _automaton():
+    """Build the Aho-Corasick automaton on first use, or None without the extension"""
+    if ahocorasick is None:
+        return None
+    ac = ahocorasick.Automaton()
+    for w in _all_stopwords():
+        ac.add_word(w, len(w))
+    ac.make_automaton()
+    return ac
+
+
+@cache
+def _stop_pattern():
+    """
+    Word-bounded alternation over every stopword, longest-first so longer
+    entries win. With the regex module this compiles to a non-backtracking
+    matcher; its bound sub is exported as `strip` for bulk in-text removal.
+    """
+    return _regex.compile(
+        r'\b(?:' + '|'.join(_regex.escape(w) for w in sorted(_all_stopwords(), key=len, reverse=True)) + r')\b',
+        _regex.IGNORECASE
+    )
+
+
+# Lazy module attributes (PEP 562): the Hindi/emoji literals and every
+# derived structure are only materialized when first accessed, so
+# English-only workflows skip the build entirely
+_LAZY_ATTRS = {
+    'HINDI_STOPWORDS': _build_hindi,
+    'EMOJI_DESCRIPTIONS': _build_emoji,
+    'ALL_STOPWORDS': _all_stopwords,
+    'STOPWORDS_BY_LANG': _by_lang,
+    'ASCII_STOPWORDS': lambda: _split_sets()[0],
+    'NON_ASCII_STOPWORDS': lambda: _split_sets()[1],
+    'strip': lambda: _stop_pattern().sub,
 }
 
-# Combine all stop words
-ALL_STOPWORDS = CUSTOM_ENGLISH_STOPWORDS.union(HINDI_STOPWORDS).union(EMOJI_DESCRIPTIONS)
 
-def get_stopwords():
+def __getattr__(name):
+    try:
+        builder = _LAZY_ATTRS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = builder()
+    globals()[name] = value
+    return value
+
+
+_TOKEN_RE = re.compile(r'\S+')
+
+
+def stopword_mask(tokens) -> np.ndarray:
     """
-    Return the set of all custom stop words
+    Vectorized stopword membership test over a sequence of lowercase tokens
+
+    With pyroaring installed, tokens are FNV-1a hashed and probed against a
+    Roaring bitmap of stopword hashes; positive hits are confirmed against
+    the frozenset to rule out collisions, so the bitmap only has to be
+    right about the (overwhelmingly common) negative case. Otherwise ASCII
+    tokens of at most 8 bytes are packed to uint64 and checked with a single
+    np.isin against the packed array, with a frozenset fallback for the rest.
+
+    Args:
+        tokens: Sequence of token strings
+
+    Returns:
+        np.ndarray: Boolean array, True where the token is a stop word
+    """
+    tokens = np.asarray(tokens, dtype=object)
+
+    bitmap = _stop_hashes()
+    if bitmap is not None:
+        all_stopwords = _all_stopwords()
+        return np.fromiter(
+            (_fnv1a(t.encode()) in bitmap and t in all_stopwords for t in tokens),
+            dtype=bool, count=len(tokens)
+        )
+    packable = np.fromiter(
+        (t.isascii() and len(t) <= 8 for t in tokens), dtype=bool, count=len(tokens)
+    )
+
+    out = np.empty(len(tokens), dtype=bool)
+    packed = tokens[packable]
+    keys = np.fromiter(
+        (int.from_bytes(t.encode().ljust(8, b'\0'), 'little') for t in packed),
+        dtype='<u8', count=len(packed)
+    )
+    out[packable] = np.isin(keys, _packed_ascii())
+    all_stopwords = _all_stopwords()
+    out[~packable] = [t in all_stopwords for t in tokens[~packable]]
+    return out
+
+
+def strip_stopwords(text: str) -> Iterator[str]:
+    """
+    Yield the non-stopword tokens of a text, lowercased
+
+    With pyahocorasick installed the whole text is scanned in one automaton
+    pass; otherwise each token is checked against the stopword sets.
+
+    Args:
+        text (str): Raw text to filter
+
+    Yields:
+        str: Tokens that are not stop words
     """
-    return ALL_STOPWORDS 
\ No newline at end of file
+    text = unicodedata.normalize("NFKC", text).casefold()
+
+    automaton = _automaton()
+    if automaton is None:
+        for token in text.split():
+            if not is_stopword(token):
+                yield token
+        return
+
+    # Mark spans of stopword matches that sit on word boundaries, then emit
+    # only the tokens whose span is untouched
+    mask = bytearray(len(text))
+    for end, length in automaton.iter(text):
+        start = end - length + 1
+        before = text[start - 1] if start > 0 else ' '
+        after = text[end + 1] if end + 1 < len(text) else ' '
+        if not (before.isalnum() or before == '_') and not (after.isalnum() or after == '_'):
+            mask[start:end + 1] = b'\x01' * length
+
+    for match in _TOKEN_RE.finditer(text):
+        if not any(mask[match.start():match.end()]):
+            yield match.group()
+
+
+@cache
+def _phf_current() -> bool:
+    """True if the generated perfect-hash table matches the live stopword set"""
+    return _phf.N == len(_all_stopwords())
+
+
+@lru_cache(maxsize=8192)
+def is_stopword(token: str) -> bool:
+    """
+    Case-insensitive stopword check, memoized per unique token
+
+    Args:
+        token (str): Token to test
+
+    Returns:
+        bool: True if the normalized token is a stop word
+    """
+    token = unicodedata.normalize("NFKC", token).casefold()
+    if _phf is not None and _phf_current():
+        return _phf.is_stopword_phf(token)
+    ascii_set, non_ascii_set = _split_sets()
+    return token in (ascii_set if token.isascii() else non_ascii_set)
+
+
+def reset_stopword_cache() -> None:
+    """
+    Clear the memoized is_stopword results
+
+    Long-running processes (and tests) can call this to drop cached
+    verdicts, e.g. after regenerating the stopword tables.
+    """
+    is_stopword.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def _union_langs(langs: frozenset[str]) -> frozenset[str]:
+    """Union the per-language sets for a frozenset of language codes"""
+    by_lang = _by_lang()
+    out = frozenset()
+    for lang in langs:
+        out |= by_lang[lang]
+    return frozenset(sys.intern(unicodedata.normalize("NFKC", w).lower()) for w in out)
+
+
+def get_stopwords(langs: Iterable[str] | None = None) -> frozenset[str]:
+    """
+    Return the (immutable) set of custom stop words
+
+    Args:
+        langs: Optional iterable of language codes ("en", "hi", "hi_latn",
+            "emoji") to restrict the set; all languages when omitted
+
+    Returns:
+        frozenset: Normalized stop words for the requested languages
+    """
+    if langs is None:
+        return _all_stopwords()
+    return _union_langs(frozenset(langs))
+
+
+__all__ = ["get_stopwords", "is_stopword", "reset_stopword_cache", "strip_stopwords", "ALL_STOPWORDS"]
@@ -0,0 +1,26 @@
+"""
+Minimal perfect-hash stopword table. GENERATED by tools/gen_phf.py -
+do not edit; re-run the generator after changing the stopword sets.
+"""
+
+N = 577
+
+G = [0, 1, 0, 0, -5, -6, 0, -10, 0, -18, -20, 0, -26, -27, 0, -29, 0, 0, 1, 1, 1, -30, -31, -32, 1, 1, -33, 1, 0, 0, -34, 1, 0, 0, -37, 1, 2, 0, -40, -41, -42, 0, 0, 0, -47, 0, -49, -50, 0, 0, 1, -51, 0, -61, 0, 1, -63, 0, -64, -65, 0, -66, -68, -70, 1, -71, -73, 1, 0, -74, 3, 1, 1, 0, 1, -78, 0, -84, -85, 0, -86, 2, -90, -92, 1, -101, -104, 0, -107, -108, -112, 0, -116, 0, 1, -117, 0, -118, 0, 0, 2, 0, 0, 6, -120, 1, -124, 0, -125, 0, 0, -126, 1, -129, 0, -132, 4, 0, -133, -134, 0, 0, 1, 0, -143, 3, -144, 0, -146, -151, 0, 1, -154, -159, -160, -165, -166, 0, 0, 3, -167, 0, -173, 1, 0, 1, 0, 0, -175, 0, -176, 2, -178, 1, 0, 2, -183, -185, 1, 2, 2, 4, 1, -193, -194, 1, 1, 1, -197, -201, 5, 0, -203, 1, -204, -206, -211, 3, 1, -212, -213, 5, 5, 6, -215, 1, -216, 1, -219, -221, -222, 0, 0, 0, -226, 0, 0, 1, 0, 0, -228, -229, -232, 1, 0, 0, 0, 0, 0, 1, -233, 7, 0, -238, 0, 1, -243, 0, 1, 0, -244, -245, -246, 0, 0, 1, 1, 0, -247, -256, 0, -259, 0, 0, -261, 0, -266, -267, 0, -270, -273, 3, -274, -286, 1, -289, 0, -293, -294, 0, 0, 1, 0, 3, -295, 3, -296, -299, 1, -301, 1, 0, 0, 0, 0, 1, 0, 0, 2, 0, 0, 3, 0, 0, 0, 2, -305, 0, -325, -327, 1, 3, 0, -328, -332, -333, 2, 0, 0, 0, -334, 0, 0, 0, -335, 1, -337, -338, -339, -343, 0, 0, 0, 3, -346, 0, 0, -348, 0, 2, 0, 2, -349, 0, 0, -350, 0, 0, -351, 0, 1, 2, -353, 1, 0, 0, 0, 0, 1, 0, 1, 3, -356, 1, 6, -360, 0, 0, -362, 0, -365, 0, 0, 2, 0, 1, 0, 4, 13, 1, 2, 0, -368, -369, 0, -370, 1, -373, -374, 6, 3, 0, 0, -376, 9, 2, 2, -380, 1, 0, -388, -390, 1, 0, 0, 0, -394, 0, -395, 0, 1, -396, 0, 0, 0, 0, 1, 0, 0, 0, 0, 2, 0, -399, -405, 0, 4, 1, -406, -407, -408, 0, -409, -410, 0, 0, -412, 2, -421, 0, -424, -426, -430, 19, -433, -437, -440, -442, 0, -445, 0, 0, 1, -447, 0, 8, 1, -455, 9, 6, 0, -458, 0, -462, 1, -463, -469, 5, -471, 0, -477, 0, -481, 5, -484, 3, 0, 0, -488, -489, 1, 0, 0, 4, 9, -492, 0, -495, 1, 1, 0, 9, -497, -498, 1, -500, 0, -501, 0, 22, 4, 0, 0, 1, -504, 1, -506, 2, -508, -518, 0, 3, -519, 0, 2, 2, 0, -520, 0, 1, 0, 0, 1, -523, 0, 0, 0, 5, 9, 0, 0, 0, 0, 0, 0, 0, 0, 3, 1, 1, 21, -533, 2, 0, 0, -545, 2, 3, 0, -549, 8, 1, 7, 0, 0, 7, 0, 1, 1, 0, 0, 0, 8, 0, 2, -550, 0, 2, 0, 1, 0, 1, 1, 2, 0, 2, -555, -558, 0, -560, 0, 3, 0, -561, 0, 0, 0, 16, -567, 0, 2, -570, 0, 0, -571, 0, -573, 0, 0, 12, -576, 0, 0, 2, -577, 0, 0]
+
+V = ['वे', 'fever', 'pointing', 'आप', 'किसको', 'एक', 'yourself', 'er', 'omg', 'woh', 's', 'girl', 'kissing', 'ring', 'location', 'kuch', 'उसको', 'unamused', 'ye', 'इसका', 'क्यों', 'had', 'same', 'किए', 'aur', 'right', 'tak', 'and', 'have', 'didn', 'हैं', 'crying', 'kind', 'description', 'मुझको', 'sticker', 'agar', 'क्या', 'होते', 'shall', 'रहता', 'kiska', 'nauseated', 'mujhko', 'iska', 'totally', 'okay', 'hum', 'ain', 'tum', 'yeh', 'foot', 'own', 'gaya', 'ok', 'media', 'hasn', 'ttys', 'live', 'our', 'होता', 'हुई', 'और', 'koi', 'changed', 'उसे', 'उनको', 'मेरा', 'कहाँ', 'गई', 'mouth', 'wow', 'गए', 'हम', 'saath', 'which', 'wouldn', 'इनका', 'jata', 'तुम्हारा', 'won', 'weren', 'himself', 'shocked', 'haven', 'तक', 'bit', 'metal', 'रहते', 'time', 'hua', 'उन्हें', 'yawning', 'जाती', 'might', 'type', 'left', 'neutral', 'but', 'उसका', 'kaun', 'eyes', 'rehna', 'isko', 'was', 'किये', 'them', 'then', 'rehti', 'its', 'icon', 'whose', 'rehte', 'photo', 'way', 'ja', 'when', 'थोड़ा', 'करते', 're', 'little', 'is', 'must', 'sob', 'will', 'तुम', 'vulcan', 'aapko', 'pretty', 'shan', 'itself', 'rn', 'kiye', 'karna', 'oh', 'selfie', 'on', 'कुछ', 'both', 'मैं', 'wonderful', 'bone', 'does', 'that', 'tooth', 'किसका', 'once', 'cold', 'जाते', 'your', 'अधिक', 'हमारा', 'ek', 'what', 'c', 'inhe', 'sleepy', 'lmao', 'हमें', 'here', 'lekin', 'raha', 'यह', 'bahut', 'do', 'crossed', 'quite', 'तीन', 'रहना', 'थी', 'no', 'tumhara', 'more', 'detective', 'हुए', 'ttyl', 'किया', 'than', 'पाँच', 'other', 'कोई', 'terrible', 'older', 'gayi', 'o', 'np', 'कब', 'गया', 'may', 'mine', 'image', 'वह', 'adhik', 'd', 'wasn', 'gaye', 'imho', 'else', 'रही', 'who', 'mustn', 'old', 'day', 'heart', 'any', 'myself', 'where', 'करता', 'couldn', 'cheh', 'index', 'u', 't', 'rahe', 'it', 'would', 'now', 'why', 'फिर', 'जाना', 'ear', 'punch', 'kaise', 'इसको', 'हुईं', 'doesn', 'hand', 'tera', 'gif', 'all', 'polish', 'these', 'eye', 'fyi', 'middle', 'करना', 'hers', 'few', 'blush', 'bhi', 'main', 'ise', 'me', 'ma', 'यहाँ', 'man', 'my', 'omitted', 'tumko', 'btw', 'literally', 'बहुत', 'link', 'par', 'pinching', 'evening', 'है', 'हो', 'has', 'का', 'तू', 'leg', 'police', 'lol', 'की', 'off', 'के', 'कौन', 'r', 'ज्यादा', 'inka', 'needn', 'under', 'themselves', 'karti', 'jate', 'video', 'y', 'supervillain', 'unhe', 'sneezing', 'again', 'karta', 'joined', 'b', 'rahi', 'रहा', 'g', 'actually', 'child', 'in', 'k', 'tear', 'रहे', 'kahan', 'ya', 'n', 'चार', 'hai', 'added', 'ours', 'kise', 'ki', 'out', 'cool', 'grin', 'hmm', 'afaik', 'कम', 'kiss', 'wave', 'only', 'morning', 'bad', 'claus', 'ourselves', 'handshake', 'zombie', 'w', 'v', 'those', 'सब', 'basically', 've', 'us', 'an', 'थीं', 'so', 'am', 'doing', 'hui', 'url', 'superhero', 'woman', 'she', 'kam', 'um', 'were', 'किसे', 'document', 'message', 'deleted', 'uh', 'aapka', 'created', 'दस', 'her', 'mightn', 'tomorrow', 'thing', 'ये', 'hamko', 'paanch', 'nose', 'hoti', 'तुम्हें', 'adult', 'तेरा', 'fairy', 'tired', 'aap', 'nice', 'hota', 'could', 'हमको', 'thinking', 'hote', 'laughing', 'दो', 'night', 'his', 'genie', 'he', 'usko', 'थे', 'ho', 'hain', 'sick', 'das', 'you', 'him', 'साथ', 'uska', 'boy', 'jab', 'yes', 'like', 'amazing', 'how', 'aren', 'में', 'नौ', 'unko', 'karte', 'जब', 'wink', 'huin', 'triumph', 'use', 'unka', 'mask', 'brb', 'kiya', 'yesterday', 'call', 'be', 'kya', 'अगर', 'char', 'month', 'ah', 'wahan', 'oncoming', 'a', 'backhand', 'fingers', 'hue', 'm', 'inko', 'tha', 'this', 'i', 'ka', 'awesome', 'thi', 'thin', 'or', 'तुझे', 'part', 'भी', 'should', 'group', 'या', 'removed', 'speechless', 'expressionless', 'index_pointing', 'bandage', 'christmas', 'some', 'yahan', 'कैसे', 'been', 'muscle', 'hadn', 'over', 'इनको', 'each', 'ke', 'raised', 'audio', 'kyun', 'down', 'yeah', 'सात', 'up', 'रहती', 'इसे', 'elf', 'clap', 'mera', 'sort', 'shouldn', 'year', 'tu', 'stuff', 'there', 'theirs', 'pls', 'kab', 'fist', 'point', 'kisko', 'll', 'are', 'nau', 'ty', 'जाता', 'contact', 'idk', 'करती', 'zyada', 'vomiting', 'आठ', 'isn', 'lot', 'blonde', 'afternoon', 'tbh', 'hamara', 'guard', 'lips', 'too', 'great', 'rofl', 'being', 'sab', 'whom', 'तुमको', 'रहीं', 'face', 'angry', 'mage', 'thx', 'hame', 'can', 'their', 'awful', 'आपका', 'था', 'aath', 'phir', 'if', 'हुआ', 'rage', 'इन्हें', 'brain', 'thoda', 'gayin', 'rahin', 'week', 'well', 'the', 'jana', 'very', 'yours', 'smile', 'person', 'उनका', 'folded', 'लेकिन', 'जा', 'missed', 'छह', 'tumhe', 'मुझे', 'teen', 'bearded', 'saat', 'wo', 'thumbs', 'आपको', 'did', 'tujhe', 'having', 'we', 'mujhe', 'nail', 'further', 'rehta', 'absolutely', 'pinch', 'tongue', 'वहाँ', 'just', 'voice', 'injured', 'subject', 'today', 'jati', 'smiley', 'imo', 'plz', 'really', 'पर', 'baby', 'होती', 'herself', 'surprised', 'definitely', 'horrible', 'such', 'hands', 'they', 'गईं', 'most', 'good']
+
+
+def _fnv(d, s):
+    if d == 0:
+        d = 0x01000193
+    for b in s.encode():
+        d = ((d * 0x01000193) ^ b) & 0xFFFFFFFF
+    return d
+
+
+def is_stopword_phf(s):
+    """O(1) membership test: one salted hash, one probe, one compare"""
+    d = G[_fnv(0, s) % N]
+    if d < 0:
+        return V[-d - 1] == s
+    return V[_fnv(d, s) % N] == s
@@ -0,0 +1,24 @@
+"""
+Regenerate the marshalled stopword blob next to stop_words.py.
+
+Run after editing the stopword literals:
+
+    python tools/build_stopwords.py
+"""
+import marshal
+import pathlib
+import sys
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from stop_words import ALL_STOPWORDS, _MARSHAL_PATH
+
+
+def main():
+    with open(_MARSHAL_PATH, 'wb') as fh:
+        marshal.dump(frozenset(ALL_STOPWORDS), fh)
+    print(f"Wrote {len(ALL_STOPWORDS)} stopwords to {_MARSHAL_PATH}")
+
+
+if __name__ == '__main__':
+    main()
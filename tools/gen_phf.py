@@ -0,0 +1,98 @@
+"""
+Generate stop_words_phf.py, a minimal perfect-hash lookup over ALL_STOPWORDS.
+
+The generated module answers membership with one salted FNV hash, one array
+probe and one string compare - no probe loop, no collisions. Re-run this
+script whenever the stopword sets change:
+
+    python tools/gen_phf.py
+"""
+import pathlib
+import sys
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+import stop_words
+
+OUT_PATH = pathlib.Path(stop_words.__file__).with_name('stop_words_phf.py')
+
+FNV_PRIME = 0x01000193
+
+
+def _fnv(d, s):
+    """Salted 32-bit FNV-1a; salt 0 falls back to the FNV prime"""
+    if d == 0:
+        d = FNV_PRIME
+    for b in s.encode():
+        d = ((d * FNV_PRIME) ^ b) & 0xFFFFFFFF
+    return d
+
+
+def build(words):
+    """
+    Build the (G, V) tables of a minimal perfect hash over `words`.
+
+    Standard two-level scheme: bucket by the unsalted hash, then for each
+    bucket (largest first) search for a salt whose salted hashes land every
+    member in a free slot. Singleton buckets get a direct slot index stored
+    as -(slot + 1).
+    """
+    words = sorted(words)
+    n = len(words)
+    buckets = [[] for _ in range(n)]
+    for w in words:
+        buckets[_fnv(0, w) % n].append(w)
+
+    G = [0] * n
+    V = [None] * n
+    for index, bucket in sorted(enumerate(buckets), key=lambda kv: -len(kv[1])):
+        if len(bucket) > 1:
+            d = 1
+            slots = []
+            while True:
+                slots.clear()
+                for w in bucket:
+                    slot = _fnv(d, w) % n
+                    if V[slot] is not None or slot in slots:
+                        break
+                    slots.append(slot)
+                else:
+                    break
+                d += 1
+            G[index] = d
+            for slot, w in zip(slots, bucket):
+                V[slot] = w
+        elif bucket:
+            slot = next(i for i in range(n) if V[i] is None)
+            G[index] = -slot - 1
+            V[slot] = bucket[0]
+    return G, V
+
+
+def main():
+    G, V = build(stop_words.ALL_STOPWORDS)
+    with open(OUT_PATH, 'w') as fh:
+        fh.write('"""\n')
+        fh.write('Minimal perfect-hash stopword table. GENERATED by tools/gen_phf.py -\n')
+        fh.write('do not edit; re-run the generator after changing the stopword sets.\n')
+        fh.write('"""\n\n')
+        fh.write(f'N = {len(V)}\n\n')
+        fh.write(f'G = {G!r}\n\n')
+        fh.write(f'V = {V!r}\n\n\n')
+        fh.write('def _fnv(d, s):\n')
+        fh.write('    if d == 0:\n')
+        fh.write(f'        d = {FNV_PRIME:#010x}\n')
+        fh.write('    for b in s.encode():\n')
+        fh.write(f'        d = ((d * {FNV_PRIME:#010x}) ^ b) & 0xFFFFFFFF\n')
+        fh.write('    return d\n\n\n')
+        fh.write('def is_stopword_phf(s):\n')
+        fh.write('    """O(1) membership test: one salted hash, one probe, one compare"""\n')
+        fh.write('    d = G[_fnv(0, s) % N]\n')
+        fh.write('    if d < 0:\n')
+        fh.write('        return V[-d - 1] == s\n')
+        fh.write('    return V[_fnv(d, s) % N] == s\n')
+    print(f"Wrote {OUT_PATH} ({len(V)} entries)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Generate stop_words_trie.npz, a byte-trie over the UTF-8 stopword set.
+
+The trie is a dense (N_states, 256) int32 transition table plus a boolean
+accept vector: membership is one table walk per byte with no hashing, and
+the whole table stays cache-resident. Re-run after changing the stopword
+sets:
+
+    python tools/gen_trie.py
+"""
+import pathlib
+import sys
+
+import numpy as np
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+import stop_words
+
+OUT_PATH = pathlib.Path(stop_words.__file__).with_name('stop_words_trie.npz')
+
+
+def build(words):
+    """Build the (transitions, accept) tables; -1 marks a dead transition"""
+    # First pass counts states so the table can be allocated in one go
+    edges = {}
+    accepting = set()
+    next_state = 1
+    for w in sorted(words):
+        state = 0
+        for b in w.encode():
+            key = (state, b)
+            if key not in edges:
+                edges[key] = next_state
+                next_state += 1
+            state = edges[key]
+        accepting.add(state)
+
+    transitions = np.full((next_state, 256), -1, dtype=np.int32)
+    for (state, b), target in edges.items():
+        transitions[state, b] = target
+    accept = np.zeros(next_state, dtype=bool)
+    accept[sorted(accepting)] = True
+    return transitions, accept
+
+
+def main():
+    transitions, accept = build(stop_words.ALL_STOPWORDS)
+    np.savez_compressed(OUT_PATH, transitions=transitions, accept=accept)
+    print(f"Wrote {OUT_PATH} ({transitions.shape[0]} states, "
+          f"{int(accept.sum())} accepting)")
+
+
+if __name__ == '__main__':
+    main()